@@ -1,18 +1,170 @@
 import sys
 import os
 import subprocess
+import asyncio
+import hashlib
+import tarfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                             QCheckBox, QComboBox, QFileDialog, QGroupBox,
-                            QMessageBox, QProgressBar, QTextEdit)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                            QMessageBox, QProgressBar, QPlainTextEdit)
+from PyQt5.QtCore import Qt, QThread, QStringListModel, pyqtSignal
 from datetime import datetime
 import webbrowser
 import time
 import signal
+import threading
 import json
 import re
+import functools
+
+# Regex to remove ANSI escape sequences, compiled once for all output loops
+_ANSI_ESCAPE = re.compile(r'''
+    \x1B  # ESC
+    (?:   # 7-bit C1 Fe
+        [@-Z\\-_]
+    |     # or [ for CSI sequences
+        \[
+        [0-?]*  # Parameter bytes
+        [ -/]*  # Intermediate bytes
+        [@-~]   # Final byte
+    )
+''', re.VERBOSE)
+
+# Dev server output announcing that it is ready, capturing the port if shown
+_READY_RE = re.compile(r'(?:ready - started server on|Local:)(?:.*?:(\d+))?')
+DEFAULT_DEV_PORT = 3000
+
+# Log lines are batched into a single signal to keep the GUI thread responsive
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 0.05  # seconds
+
+# Lines kept in the installation log before the oldest are dropped
+LOG_MAX_LINES = 5000
+
+# Size of each raw read from a subprocess pipe
+READ_CHUNK_SIZE = 65536
+
+# Global npm packages required to create a project
+REQUIRED_GLOBALS = ['next', 'create-next-app', 'typescript']
+
+# Where setup.py installs those packages from its lockfile, checked before
+# the global npm root
+NODE_TOOLS_DIR = Path(__file__).resolve().parent / 'tools' / 'node'
+LOCAL_NODE_MODULES = NODE_TOOLS_DIR / 'node_modules'
+
+# Base dependencies for shadcn/ui and the project utilities
+BASE_DEPS = [
+    '@radix-ui/react-icons',
+    '@radix-ui/react-slot',
+    'class-variance-authority',
+    'clsx',
+    'tailwind-merge',
+    'lucide-react',
+    'tailwindcss-animate'
+]
+
+# Default state of each checkbox, keyed by its name without the _check suffix
+_DEFAULTS = {
+    # Next.js Options
+    'typescript': True,
+    'tailwind': True,
+    'eslint': True,
+    'src_dir': True,
+    'app_router': True,
+    'turbo': False,
+    'alias': True,
+    # Style Options
+    'css_vars': True,
+    # Additional Features
+    'redux': False,
+    'axios': False,
+    'router': False,
+    'auth': False,
+    'prisma': False,
+    'forms': False,
+    'query': False,
+    # Additional Options
+    'git': False,
+    'build': True,
+    'open_vscode': True,
+    'start_dev': True,
+    'open_browser': True
+}
+
+# Packages installed for each optional feature, keyed by config option
+FEATURE_DEPS = {
+    'use_redux': ['@reduxjs/toolkit', 'react-redux'],
+    'use_axios': ['axios'],
+    'use_router': [],  # next/router ships with next
+    'use_auth': ['next-auth'],
+    'use_prisma': ['@prisma/client'],
+    'use_forms': ['react-hook-form'],
+    'use_query': ['@tanstack/react-query']
+}
+FEATURE_DEV_DEPS = {
+    'use_prisma': ['prisma']
+}
+
+# Fingerprint of the last successful dependency check
+DEPS_CACHE_FILE = Path.home() / '.cache' / 'next_express' / 'deps.json'
+
+# Versions of the Node.js tools setup.py installs into NODE_TOOLS_DIR
+with open(NODE_TOOLS_DIR / 'package.json') as f:
+    NODE_TOOLS_VERSIONS = json.load(f)['dependencies']
+
+# Pinned create-next-app, run directly with node from the copy setup.py
+# installs, or else from one unpacked once into the cache
+CREATE_NEXT_APP_VERSION = NODE_TOOLS_VERSIONS['create-next-app']
+CREATE_NEXT_APP_DIR = Path.home() / '.cache' / 'next_express' / f'create-next-app-{CREATE_NEXT_APP_VERSION}'
+
+# Pinned shadcn CLI, run from the copy setup.py installs when present. Its
+# init takes --yes and --css-variables; the style, base color and React
+# compatibility choices are answered at their prompts
+SHADCN_VERSION = NODE_TOOLS_VERSIONS['shadcn']
+
+# Snapshots of freshly created projects, one per set of create-next-app options
+TEMPLATE_CACHE_DIR = Path.home() / '.cache' / 'next_express' / 'templates'
+
+def _package_bin(package_dir, name):
+    """Return the script an installed npm package runs for the given command"""
+    entry = json.loads((package_dir / 'package.json').read_text())['bin']
+    if isinstance(entry, dict):
+        entry = entry[name]
+    return package_dir / entry
+
+class _LineSplitter:
+    """
+    Turn raw chunks read from a pipe into complete lines of plain text,
+    keeping any trailing partial line until the next chunk arrives
+    """
+
+    def __init__(self):
+        self._tail = bytearray()
+
+    def feed(self, chunk):
+        """
+        Return the non-empty lines completed by chunk. An empty chunk marks
+        the end of the stream and returns whatever partial line is left
+        """
+        self._tail += chunk
+        cut = self._tail.rfind(b'\n') + 1 if chunk else len(self._tail)
+        if not cut:
+            return []
+        data = bytes(self._tail[:cut])
+        del self._tail[:cut]
+
+        # Decode and strip ANSI codes once per chunk of complete lines
+        text = _ANSI_ESCAPE.sub('', data.decode('utf-8', 'replace'))
+        return [line.strip() for line in text.splitlines() if line.strip()]
+
+@functools.lru_cache(maxsize=None)
+def _prompt_pattern(prompts):
+    """Compile a regex matching any of the given prompts, once per prompt set"""
+    return re.compile('|'.join(re.escape(prompt) for prompt in prompts))
 
 class ProjectSetupThread(QThread):
     progress = pyqtSignal(str)
@@ -24,12 +176,73 @@ class ProjectSetupThread(QThread):
         super().__init__()
         self.config = config
         self.dev_server_process = None
+        # Snapshot of the environment, merged with per-command overrides
+        self._base_env = dict(os.environ)
+        self.dev_server_port = None
+        self._log_buf = []
+        self._log_lock = threading.Lock()
+        self._last_flush = time.monotonic()
 
     def log_message(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log.emit(f"[{timestamp}] {message}")
+        with self._log_lock:
+            self._log_buf.append(f"[{timestamp}] {message}")
+            due = (len(self._log_buf) >= LOG_BATCH_SIZE
+                   or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL)
+        if due:
+            self._flush_logs()
+
+    def _flush_logs(self):
+        """Emit all buffered log lines as one block"""
+        with self._log_lock:
+            batch = self._log_buf
+            self._log_buf = []
+            self._last_flush = time.monotonic()
+        if batch:
+            self.log.emit("\n".join(batch))
+
+    async def _stream_output(self, process, on_line=None):
+        """
+        Log stdout and stderr of a running process until it exits.
+        Both pipes are drained together so a full stderr pipe can never stall
+        the child. Returns the stderr text for error reporting.
+        """
+        stderr_lines = []
+
+        async def drain(stream, is_stderr):
+            splitter = _LineSplitter()
+            while True:
+                chunk = await stream.read(READ_CHUNK_SIZE)
+                for line in splitter.feed(chunk):
+                    self.log_message(line)
+                    if is_stderr:
+                        stderr_lines.append(line)
+                    if on_line:
+                        on_line(line)
+                if not chunk:
+                    break
+
+        async def flush_periodically():
+            # Lines logged just after a flush would otherwise wait for the
+            # next line, which a quiet or hung step may never print
+            while True:
+                await asyncio.sleep(LOG_FLUSH_INTERVAL)
+                self._flush_logs()
+
+        # Show the step's start right away, not with its first output
+        self._flush_logs()
+        flusher = asyncio.ensure_future(flush_periodically())
+        try:
+            await asyncio.gather(
+                drain(process.stdout, False),
+                drain(process.stderr, True),
+                process.wait()
+            )
+        finally:
+            flusher.cancel()
+        return "\n".join(stderr_lines)
 
-    def run_command(self, command, cwd, description, env=None):
+    async def run_command(self, command, cwd, description, env=None):
         """
         Run a command and stream its output to the log
         """
@@ -37,37 +250,20 @@ class ProjectSetupThread(QThread):
 
         # Merge provided environment variables with the default
         if env is not None:
-            final_env = os.environ.copy()
-            final_env.update(env)
+            final_env = {**self._base_env, **env}
         else:
             final_env = None
 
-        process = subprocess.Popen(
-            command,
+        process = await asyncio.create_subprocess_exec(
+            *command,
             cwd=cwd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             env=final_env
         )
 
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                self.log_message(output.strip())
-
-        # Wait for the process to complete
-        stdout, stderr = process.communicate()
-
-        # Log any remaining output
-        if stdout:
-            self.log_message(stdout)
-        if stderr:
-            self.log_message(stderr)
+        stderr = await self._stream_output(process)
+        self._flush_logs()
 
         # Check for errors
         if process.returncode != 0:
@@ -75,74 +271,41 @@ class ProjectSetupThread(QThread):
 
         return process.returncode
 
-    def run_command_with_input(self, command, cwd, description, responses, env=None):
+    async def run_command_with_input(self, command, cwd, description, responses, env=None):
         """
         Run a command and handle interactive prompts
         """
-        import re
-        import os
-
         self.log_message(f"Running: {description}")
 
         # Merge provided environment variables with the default
         if env is not None:
-            final_env = os.environ.copy()
-            final_env.update(env)
+            final_env = {**self._base_env, **env}
         else:
             final_env = None
 
-        # Compile regex to remove ANSI escape sequences
-        ansi_escape = re.compile(r'''
-            \x1B  # ESC
-            (?:   # 7-bit C1 Fe
-                [@-Z\\-_]
-            |     # or [ for CSI sequences
-                \[
-                [0-?]*  # Parameter bytes
-                [ -/]*  # Intermediate bytes
-                [@-~]   # Final byte
-            )
-        ''', re.VERBOSE)
-
-        buffer = ''
+        # Scan each line for all prompts in a single pass
+        prompt_re = _prompt_pattern(tuple(responses))
 
-        process = subprocess.Popen(
-            command,
+        process = await asyncio.create_subprocess_exec(
+            *command,
             cwd=cwd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             env=final_env
         )
 
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                # Remove ANSI escape sequences
-                clean_output = ansi_escape.sub('', output.strip())
-                self.log_message(clean_output)
-                buffer += clean_output + '\n'
-
-                # Check if any of our prompts are in the buffer
-                for prompt, response in responses.items():
-                    if prompt in clean_output:
-                        self.log_message(f"Responding to prompt: {prompt}")
-                        process.stdin.write(response)
-                        process.stdin.flush()
-                        buffer = ''  # Reset buffer after finding a prompt
-                        break
-
-        # Wait for the process to complete
-        stdout, stderr = process.communicate()
-
-        # Log any remaining output
-        if stdout:
-            self.log_message(stdout)
-        if stderr:
-            self.log_message(stderr)
+        def respond(clean_output):
+            match = prompt_re.search(clean_output)
+            if match:
+                prompt = match.group(0)
+                self.log_message(f"Responding to prompt: {prompt}")
+                self._flush_logs()
+                process.stdin.write(responses[prompt].encode())
+
+        stderr = await self._stream_output(process, on_line=respond)
+        process.stdin.close()
+        self._flush_logs()
 
         # Check for errors
         if process.returncode != 0:
@@ -154,44 +317,98 @@ class ProjectSetupThread(QThread):
         """
         Remove ANSI escape sequences from the text for cleaner matching
         """
-        import re
-        ansi_escape = re.compile(r'''
-            \x1B  # ESC
-            (?:   # 7-bit C1 Fe
-                [@-Z\\-_]
-            |     # or [ for CSI sequences
-                \[
-                [0-?]*  # Parameter bytes
-                [ -/]*  # Intermediate bytes
-                [@-~]   # Final byte
-            )
-        ''', re.VERBOSE)
-        return ansi_escape.sub('', text)
+        return _ANSI_ESCAPE.sub('', text)
 
     def check_dependencies(self):
         """Check if all required dependencies are installed"""
         try:
-            # Check Node.js and npm
-            node_version = subprocess.run(['node', '--version'], capture_output=True, text=True)
-            npm_version = subprocess.run(['npm', '--version'], capture_output=True, text=True)
-            
-            if node_version.returncode != 0 or npm_version.returncode != 0:
+            # Skip the checks if node and the global packages are unchanged
+            # since the last successful run
+            cached = self._load_deps_cache()
+            if cached and cached == self._deps_fingerprint(cached.get('npm_root')):
+                self.log_message("Dependencies unchanged since last check")
+                return True
+
+            def probe(command):
+                return subprocess.run(command, capture_output=True, text=True)
+
+            # Check Node.js and npm, and locate the node_modules holding
+            # the required packages
+            probes = [['node', '--version'], ['npm', '--version']]
+            if LOCAL_NODE_MODULES.is_dir():
+                npm_root = str(LOCAL_NODE_MODULES)
+            else:
+                npm_root = self._npm_root_from_env()
+            if npm_root is None:
+                probes.append(['npm', 'root', '-g'])
+
+            with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+                results = list(pool.map(probe, probes))
+
+            if any(result.returncode != 0 for result in results[:2]):
                 raise Exception("Node.js and npm are required but not found")
-            
-            # Check required global packages
-            required_globals = ['next', 'create-next-app', 'typescript']
-            for pkg in required_globals:
-                result = subprocess.run(['npm', 'list', '-g', pkg], capture_output=True, text=True)
-                if result.returncode != 0:
+            if npm_root is None:
+                npm_root = results[2].stdout.strip()
+
+            # Check required global packages directly on disk
+            for pkg in REQUIRED_GLOBALS:
+                if not Path(npm_root, pkg).is_dir():
                     raise Exception(f"Required global package {pkg} not found")
-                
+
+            self._save_deps_cache(self._deps_fingerprint(npm_root))
             return True
             
         except Exception as e:
             self.log_message(f"Dependency check failed: {str(e)}")
             return False
 
+    def _npm_root_from_env(self):
+        """
+        Derive the global node_modules directory from an npm prefix set in
+        the environment, or return None if npm has to be asked
+        """
+        prefix = os.environ.get('NPM_CONFIG_PREFIX') or os.environ.get('npm_config_prefix')
+        if not prefix:
+            return None
+        if os.name == 'nt':
+            return os.path.join(prefix, 'node_modules')
+        return os.path.join(prefix, 'lib', 'node_modules')
+
+    def _deps_fingerprint(self, npm_root):
+        """
+        Identify the node install and global packages without spawning node
+        """
+        try:
+            node = shutil.which('node')
+            return {
+                'node': node,
+                'node_mtime': os.stat(node).st_mtime,
+                'npm_root': npm_root,
+                'npm_root_mtime': os.stat(npm_root).st_mtime
+            }
+        except (TypeError, OSError):
+            return None
+
+    def _load_deps_cache(self):
+        try:
+            with open(DEPS_CACHE_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_deps_cache(self, fingerprint):
+        if fingerprint is None:
+            return
+        try:
+            DEPS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            DEPS_CACHE_FILE.write_text(json.dumps(fingerprint))
+        except OSError as e:
+            self.log_message(f"Could not cache dependency check: {str(e)}")
+
     def run(self):
+        asyncio.run(self._run_all())
+
+    async def _run_all(self):
         try:
             project_path = Path(self.config['project_path']) / self.config['project_name']
             
@@ -204,12 +421,8 @@ class ProjectSetupThread(QThread):
             self.progress.emit("Creating Next.js project structure...")
             self.log_message(f"Creating project at: {project_path}")
             
-            # Build create-next-app command with progress updates
-            create_command = [
-                'npx',
-                '--yes',
-                'create-next-app@latest',
-                self.config['project_name'],
+            # Build create-next-app options
+            create_flags = [
                 '--ts' if self.config['use_typescript'] else '--js',
                 '--tailwind' if self.config['use_tailwind'] else '--no-tailwind',
                 '--eslint' if self.config['use_eslint'] else '--no-eslint',
@@ -220,73 +433,42 @@ class ProjectSetupThread(QThread):
             ]
 
             if self.config['custom_import_alias']:
-                create_command.extend(['--import-alias', self.config['import_alias']])
-
-            self.log_message(f"Running command: {' '.join(create_command)}")
-            
-            # Execute with real-time progress updates
-            process = subprocess.Popen(
-                create_command,
-                cwd=self.config['project_path'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env={**os.environ, 'CI': 'true', 'NEXT_TELEMETRY_DISABLED': '1'}
-            )
+                create_flags.extend(['--import-alias', self.config['import_alias']])
+
+            # Projects with the same options share a cached template, which
+            # npm ci installs from its lockfile without resolving anything
+            template_key = hashlib.sha1(
+                ' '.join([CREATE_NEXT_APP_VERSION] + create_flags).encode()
+            ).hexdigest()[:16]
+            template_dir = TEMPLATE_CACHE_DIR / template_key
+            if (template_dir / 'package-lock.json').is_file():
+                await self.create_from_template(template_dir, project_path)
+            else:
+                await self.create_next_app(create_flags)
+                self.save_template(project_path, template_dir)
 
-            # Stream output with progress updates
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    output = output.strip()
-                    self.log_message(output)
-                    
-                    # Update progress based on output content
-                    if "Creating" in output:
-                        self.progress.emit("Creating project structure...")
-                    elif "Installing" in output:
-                        self.progress.emit("Installing dependencies...")
-                    elif "Success" in output:
-                        self.progress.emit("Project structure created!")
-
-            # Check for errors
-            if process.returncode != 0:
-                stderr = process.stderr.read()
-                raise Exception(f"Project creation failed: {stderr}")
-
-            # Additional features installation
-            if any([
-                self.config['use_redux'],
-                self.config['use_axios'],
-                self.config['use_router'],
-                self.config['use_auth'],
-                self.config['use_prisma'],
-                self.config['use_forms'],
-                self.config['use_query']
-            ]):
-                self.progress.emit("Installing additional features...")
-                self.install_additional_features(project_path)
+            # Project dependencies and additional features, installed together
+            self.progress.emit("Installing project dependencies...")
+            await self.install_project_dependencies(project_path)
 
             # Setup shadcn/ui
             self.progress.emit("Setting up shadcn/ui components...")
-            self.setup_shadcn_and_utilities(project_path)
+            await self.setup_shadcn_and_utilities(project_path)
 
             # Git initialization
             if self.config['init_git']:
                 self.progress.emit("Initializing Git repository...")
-                self.run_command(['git', 'init'], project_path, "Initializing Git")
+                await self.run_command(['git', 'init'], project_path, "Initializing Git")
 
             # Build project
             if self.config['build_project']:
                 self.progress.emit("Building project...")
-                self.run_command(['npm', 'run', 'build'], project_path, "Building project")
+                await self.run_command(['npm', 'run', 'build'], project_path, "Building project")
 
             # Open in VS Code
             if self.config['open_vscode']:
                 self.progress.emit("Opening in VS Code...")
-                self.run_command(['code', '.'], project_path, "Opening VS Code")
+                await self.run_command(['code', '.'], project_path, "Opening VS Code")
 
             # Start development server
             if self.config['start_dev']:
@@ -294,55 +476,204 @@ class ProjectSetupThread(QThread):
                 self.start_dev_server(project_path)
 
             self.progress.emit("Project creation completed! 🚀")
+            self._flush_logs()
             self.finished.emit(True, "Project created successfully!")
 
         except Exception as e:
             self.log_message(f"Error: {str(e)}")
             self.progress.emit("Error occurred during project creation")
+            self._flush_logs()
             self.finished.emit(False, f"Error: {str(e)}")
 
-    def install_project_dependencies(self, project_path):
-        """Install project-specific dependencies"""
+    async def create_next_app(self, create_flags):
+        """Create the project with create-next-app"""
+        cli = await self._create_next_app_cli()
+        if cli is not None:
+            create_command = ['node', str(cli), self.config['project_name']] + create_flags
+        else:
+            create_command = [
+                'npx',
+                '--yes',
+                f'create-next-app@{CREATE_NEXT_APP_VERSION}',
+                self.config['project_name']
+            ] + create_flags
+
+        self.log_message(f"Running command: {' '.join(create_command)}")
+
+        # Execute with real-time progress updates
+        process = await asyncio.create_subprocess_exec(
+            *create_command,
+            cwd=self.config['project_path'],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**self._base_env, 'CI': 'true', 'NEXT_TELEMETRY_DISABLED': '1'}
+        )
+
+        # Stream output with progress updates
+        stderr = await self._stream_output(process, on_line=self._track_create_progress)
+        self._flush_logs()
+
+        # Check for errors
+        if process.returncode != 0:
+            raise Exception(f"Project creation failed: {stderr}")
+
+    async def _create_next_app_cli(self):
+        """
+        Return the entry script of the pinned create-next-app, preferring the
+        copy setup.py installed, else fetching and unpacking it on first use,
+        or None if it could not be fetched
+        """
+        package_dir = LOCAL_NODE_MODULES / 'create-next-app'
+        if not (package_dir / 'package.json').is_file():
+            package_dir = CREATE_NEXT_APP_DIR / 'package'
         try:
-            deps = [
-                '@radix-ui/react-icons',
-                '@radix-ui/react-slot',
-                'class-variance-authority',
-                'clsx',
-                'tailwind-merge',
-                'lucide-react',
-                'tailwindcss-animate'
-            ]
-            
-            install_command = ['npm', 'install', '--save-dev'] + deps
-            self.run_command(install_command, project_path, "Installing project dependencies")
-            
+            if not package_dir.is_dir():
+                CREATE_NEXT_APP_DIR.mkdir(parents=True, exist_ok=True)
+                await self.run_command(
+                    ['npm', 'pack', f'create-next-app@{CREATE_NEXT_APP_VERSION}',
+                     '--pack-destination', str(CREATE_NEXT_APP_DIR)],
+                    None,
+                    f"Fetching create-next-app {CREATE_NEXT_APP_VERSION}"
+                )
+                tarball = CREATE_NEXT_APP_DIR / f'create-next-app-{CREATE_NEXT_APP_VERSION}.tgz'
+
+                # Unpack next to the final location so a partial extract is never used
+                staging_dir = CREATE_NEXT_APP_DIR / 'staging'
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                with tarfile.open(tarball) as tar:
+                    if hasattr(tarfile, 'data_filter'):
+                        tar.extractall(staging_dir, filter='data')
+                    else:
+                        tar.extractall(staging_dir)
+                os.replace(staging_dir / 'package', package_dir)
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                tarball.unlink()
+
+            return _package_bin(package_dir, 'create-next-app')
+
         except Exception as e:
-            raise Exception(f"Failed to install project dependencies: {str(e)}")
+            self.log_message(f"Falling back to npx for create-next-app: {str(e)}")
+            return None
+
+    async def create_from_template(self, template_dir, project_path):
+        """Create the project from a cached template and install it with npm ci"""
+        self.progress.emit("Creating project from cached template...")
+        shutil.copytree(template_dir, project_path)
+
+        # Rename the cached project to the requested name
+        project_name = self.config['project_name']
+        package_json = project_path / 'package.json'
+        package = json.loads(package_json.read_text())
+        package['name'] = project_name
+        package_json.write_text(json.dumps(package, indent=2) + '\n')
+
+        package_lock = project_path / 'package-lock.json'
+        lock = json.loads(package_lock.read_text())
+        lock['name'] = project_name
+        if '' in lock.get('packages', {}):
+            lock['packages']['']['name'] = project_name
+        package_lock.write_text(json.dumps(lock, indent=2) + '\n')
+
+        self.progress.emit("Installing dependencies...")
+        await self.run_command(['npm', 'ci'], project_path, "Installing from lockfile",
+                               env={'NEXT_TELEMETRY_DISABLED': '1'})
+        await self._init_template_git(project_path)
+        self.progress.emit("Project structure created!")
+
+    async def _init_template_git(self, project_path):
+        """
+        Give a project created from a template the repository and initial
+        commit create-next-app makes, which the template leaves out. Like
+        create-next-app, skip this inside an existing repository and undo
+        it quietly if any step fails
+        """
+        async def succeeds(*command):
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=project_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            return await process.wait() == 0
 
-    def setup_shadcn_and_utilities(self, project_path):
         try:
-            self.log_message("Setting up shadcn/ui with selected options...")
+            if await succeeds('git', 'rev-parse', '--is-inside-work-tree'):
+                return
+            await self.run_command(['git', 'init'], project_path, "Initializing Git")
+            if not await succeeds('git', 'config', 'init.defaultBranch'):
+                await self.run_command(['git', 'checkout', '-b', 'main'], project_path,
+                                       "Switching to main branch")
+            await self.run_command(['git', 'add', '-A'], project_path, "Staging project files")
+            await self.run_command(['git', 'commit', '-m', 'Initial commit from Create Next App'],
+                                   project_path, "Creating initial commit")
+        except Exception as e:
+            shutil.rmtree(project_path / '.git', ignore_errors=True)
+            self.log_message(f"Skipped git initialization: {str(e)}")
 
-            # Install base dependencies
-            deps = [
-                '@radix-ui/react-icons',
-                '@radix-ui/react-slot',
-                'class-variance-authority',
-                'clsx',
-                'tailwind-merge',
-                'lucide-react',
-                'tailwindcss-animate'
-            ]
+    def save_template(self, project_path, template_dir):
+        """Snapshot a freshly created project for later runs with the same options"""
+        if not (project_path / 'package-lock.json').is_file():
+            return
+        staging_dir = template_dir.with_name(template_dir.name + '.tmp')
+        try:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            shutil.copytree(
+                project_path,
+                staging_dir,
+                ignore=shutil.ignore_patterns('node_modules', '.git', '.next')
+            )
+            os.replace(staging_dir, template_dir)
+        except OSError as e:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            self.log_message(f"Could not cache project template: {str(e)}")
+
+    def _track_create_progress(self, output):
+        """Update progress based on create-next-app output content"""
+        if "Creating" in output:
+            self.progress.emit("Creating project structure...")
+        elif "Installing" in output:
+            self.progress.emit("Installing dependencies...")
+        elif "Success" in output:
+            self.progress.emit("Project structure created!")
+
+    async def install_project_dependencies(self, project_path):
+        """
+        Install project-specific dependencies and all selected features,
+        with one npm install for runtime packages and one for dev packages
+        """
+        try:
+            deps = []
+            dev_deps = list(BASE_DEPS)
+            for option, packages in FEATURE_DEPS.items():
+                if self.config[option]:
+                    deps.extend(packages)
+                    dev_deps.extend(FEATURE_DEV_DEPS.get(option, []))
 
-            install_command = ['npm', 'install', '--save-dev'] + deps
-            self.run_command(install_command, project_path, "Installing dependencies")
+            if deps:
+                install_command = ['npm', 'install', '--save'] + deps
+                await self.run_command(install_command, project_path, "Installing additional features")
 
-            # Initialize shadcn/ui with user preferences
-            init_command = [
-                'npx',
-                'shadcn@latest',
-                'init'
+            install_command = ['npm', 'install', '--save-dev'] + dev_deps
+            await self.run_command(install_command, project_path, "Installing project dependencies")
+
+        except Exception as e:
+            raise Exception(f"Failed to install project dependencies: {str(e)}")
+
+    async def setup_shadcn_and_utilities(self, project_path):
+        try:
+            self.log_message("Setting up shadcn/ui with selected options...")
+
+            # Initialize shadcn/ui with user preferences, passing what the
+            # pinned CLI accepts as flags instead of answering prompts
+            shadcn_dir = LOCAL_NODE_MODULES / 'shadcn'
+            if (shadcn_dir / 'package.json').is_file():
+                shadcn_command = ['node', str(_package_bin(shadcn_dir, 'shadcn'))]
+            else:
+                shadcn_command = ['npx', f'shadcn@{SHADCN_VERSION}']
+            init_command = shadcn_command + [
+                'init',
+                '--yes',
+                '--css-variables' if self.config['use_css_vars'] else '--no-css-variables'
             ]
 
             # Set environment variables to handle peer dependencies
@@ -365,11 +696,10 @@ class ProjectSetupThread(QThread):
             responses = {
                 "Which style would you like to use?": f"{shadcn_style}\n",
                 "Which color would you like to use as the base color?": f"{color_name.lower()}\n",
-                "Would you like to use CSS variables for theming?": "yes\n" if self.config['use_css_vars'] else "no\n",
                 "How would you like to proceed?": f"{self.config['react_compat']}\n"
             }
 
-            self.run_command_with_input(init_command, project_path, "Initializing shadcn/ui", responses, env=env)
+            await self.run_command_with_input(init_command, project_path, "Initializing shadcn/ui", responses, env=env)
 
             self.log_message("shadcn/ui has been initialized with selected settings.")
 
@@ -380,49 +710,72 @@ class ProjectSetupThread(QThread):
     def start_dev_server(self, project_path):
         self.log_message("Starting development server...")
         dev_command = ['npm', 'run', 'dev']
-        
+
+        # Run the server in its own process group so it can be stopped as a whole
+        if os.name == 'posix':
+            group_options = {'start_new_session': True}
+        else:
+            group_options = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+
         self.dev_server_process = subprocess.Popen(
             dev_command,
             cwd=project_path,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            stderr=subprocess.STDOUT,
+            **group_options
         )
 
-        # Wait for server to be ready
-        ready = False
-        start_time = time.time()
-        while not ready and (time.time() - start_time) < 30:
-            output = self.dev_server_process.stdout.readline()
-            if output:
-                self.log_message(output.strip())
-                if "ready - started server on" in output or "Local:" in output:
-                    port = int(output.split("localhost:")[1].strip())
-                    ready = True
-                    time.sleep(2)
-                    break
+        # Watch the output on a background thread, which keeps draining it
+        # for as long as the server runs and reacts once it is ready, so
+        # setup does not wait on the server
+        self.dev_server_port = None
+        threading.Thread(target=self._watch_dev_server, daemon=True).start()
+        self._flush_logs()
+
+    def _watch_dev_server(self):
+        """Log dev server output and announce the server once it reports its port"""
+        fd = self.dev_server_process.stdout.fileno()
+        splitter = _LineSplitter()
+        while True:
+            chunk = os.read(fd, READ_CHUNK_SIZE)
+
+            # Lines arrive without colors, which could break the readiness match
+            for output in splitter.feed(chunk):
+                self.log_message(output)
+                if self.dev_server_port is None:
+                    match = _READY_RE.search(output)
+                    if match:
+                        port = match.group(1)
+                        self.dev_server_port = int(port) if port else DEFAULT_DEV_PORT
+                        self._dev_server_ready()
+            self._flush_logs()
+
+            if not chunk:
+                break
 
-        if ready:
-            self.log_message(f"Development server is ready on port {port}!")
-            if self.config['open_browser']:
-                self.log_message(f"Opening in browser at port {port}...")
-                webbrowser.open(f'http://localhost:{port}')
+    def _dev_server_ready(self):
+        port = self.dev_server_port
+        self.log_message(f"Development server is ready on port {port}!")
+        if self.config['open_browser']:
+            self.log_message(f"Opening in browser at port {port}...")
+            webbrowser.open(f'http://localhost:{port}')
+        self._flush_logs()
+        self.dev_server_started.emit(True)
 
     def stop_dev_server(self):
         if self.dev_server_process:
             try:
                 if os.name == 'posix':  # macOS and Linux
-                    # Kill all Next.js processes
-                    subprocess.run(['pkill', '-f', 'next'], stderr=subprocess.DEVNULL)
+                    # Stop npm and the Next.js processes it started
+                    os.killpg(os.getpgid(self.dev_server_process.pid), signal.SIGTERM)
                 else:
-                    self.dev_server_process.terminate()
+                    self.dev_server_process.send_signal(signal.CTRL_BREAK_EVENT)
                 
                 self.dev_server_process.wait(timeout=5)
                 self.log_message("Development server stopped.")
             except Exception as e:
                 self.log_message(f"Error stopping server: {str(e)}")
+            self._flush_logs()
 
 class NextMakerGUI(QMainWindow):
     def __init__(self):
@@ -491,9 +844,7 @@ class NextMakerGUI(QMainWindow):
         self.alias_check = QCheckBox("Custom Import Alias")
         self.alias_input = QLineEdit("@/*")
         self.alias_input.setEnabled(False)
-        self.alias_check.stateChanged.connect(
-            lambda state: self.alias_input.setEnabled(state == Qt.Checked)
-        )
+        self.alias_check.stateChanged.connect(self._update_alias_input)
         alias_layout.addWidget(self.alias_check)
         alias_layout.addWidget(self.alias_input)
 
@@ -529,7 +880,13 @@ class NextMakerGUI(QMainWindow):
         # Color selector
         color_selector_layout = QHBoxLayout()
         self.color_combo = QComboBox()
-        self.color_combo.addItems(['Neutral', 'Gray', 'Zinc', 'Stone', 'Slate'])
+
+        # Color models are built once and swapped in when the style changes
+        self._all_colors_model = QStringListModel(['Neutral', 'Gray', 'Zinc', 'Stone', 'Slate'], self)
+        self._palette_color_models = {
+            style: QStringListModel([style], self)
+            for style in ['Zinc', 'Slate', 'Stone', 'Gray']
+        }
         color_selector_layout.addWidget(QLabel("Base Color:"))
         color_selector_layout.addWidget(self.color_combo)
         
@@ -544,27 +901,15 @@ class NextMakerGUI(QMainWindow):
         )
         self.style_combo.setToolTip(style_tooltip)
         
-        # Update color selector based on style selection
-        def update_color_options(style_name):
-            self.color_combo.clear()
-            if style_name.lower() in ['zinc', 'slate', 'stone', 'gray']:
-                # For palette-specific styles, only show that color
-                self.color_combo.addItem(style_name)
-                self.color_combo.setEnabled(False)
-            else:
-                # For Default and New York styles, show all color options
-                self.color_combo.addItems(['Neutral', 'Gray', 'Zinc', 'Stone', 'Slate'])
-                self.color_combo.setEnabled(True)
-        
-        # Connect the signal after both combo boxes are created
-        self.style_combo.currentTextChanged.connect(update_color_options)
+        # Update color selector based on style selection, connecting the
+        # signal after both combo boxes are created
+        self.style_combo.currentTextChanged.connect(self._update_color_options)
         
         # Initialize color options based on default selection
-        update_color_options(self.style_combo.currentText())
+        self._update_color_options(self.style_combo.currentText())
         
         # CSS Variables option
         self.css_vars_check = QCheckBox("Use CSS Variables for Theming")
-        self.css_vars_check.setChecked(True)
         
         # React compatibility option
         self.react_compat_combo = QComboBox()
@@ -620,13 +965,6 @@ class NextMakerGUI(QMainWindow):
         self.start_dev_check = QCheckBox("Start Development Server")
         self.open_browser_check = QCheckBox("Open in Browser")
 
-        # Set defaults
-        self.git_check.setChecked(False)
-        self.build_check.setChecked(True)
-        self.open_vscode_check.setChecked(True)
-        self.start_dev_check.setChecked(True)
-        self.open_browser_check.setChecked(True)
-
         options_layout.addWidget(self.git_check)
         options_layout.addWidget(self.build_check)
         options_layout.addWidget(self.open_vscode_check)
@@ -642,8 +980,9 @@ class NextMakerGUI(QMainWindow):
         # Log Window (Right Panel)
         log_group = QGroupBox("Installation Log")
         log_layout = QVBoxLayout()
-        self.log_window = QTextEdit()
+        self.log_window = QPlainTextEdit()
         self.log_window.setReadOnly(True)
+        self.log_window.setMaximumBlockCount(LOG_MAX_LINES)
         log_layout.addWidget(self.log_window)
         log_group.setLayout(log_layout)
         right_panel.addWidget(log_group)
@@ -665,42 +1004,37 @@ class NextMakerGUI(QMainWindow):
         # Add the horizontal layout to the main layout
         layout.addLayout(h_layout)
 
-        # Set default values for Next.js Options
-        self.typescript_check.setChecked(True)
-        self.tailwind_check.setChecked(True)
-        self.eslint_check.setChecked(True)
-        self.src_dir_check.setChecked(True)
-        self.app_router_check.setChecked(True)
-        self.turbo_check.setChecked(False)
-        
+        # Set defaults without dispatching stateChanged during startup
+        for name, checked in _DEFAULTS.items():
+            check = getattr(self, f'{name}_check')
+            check.blockSignals(True)
+            check.setChecked(checked)
+            check.blockSignals(False)
+
         # Set default Import Alias
-        self.alias_check.setChecked(True)
         self.alias_input.setText("@/*")
-        self.alias_input.setEnabled(True)
+        self.alias_input.setEnabled(self.alias_check.isChecked())
 
         # Set default Package Manager
         pm_index = self.pm_combo.findText('npm')
         if pm_index >= 0:
             self.pm_combo.setCurrentIndex(pm_index)
 
-        # Set default Additional Features (all unchecked)
-        self.redux_check.setChecked(False)
-        self.axios_check.setChecked(False)
-        self.router_check.setChecked(False)
-        self.auth_check.setChecked(False)
-        self.prisma_check.setChecked(False)
-        self.forms_check.setChecked(False)
-        self.query_check.setChecked(False)
-
-        # Set default Additional Options
-        self.git_check.setChecked(False)
-        self.build_check.setChecked(True)
-        self.open_vscode_check.setChecked(True)
-        self.start_dev_check.setChecked(True)
-        self.open_browser_check.setChecked(True)
-
-    def log_message(self, message):
-        self.log_window.append(message)
+    def _update_alias_input(self, state):
+        self.alias_input.setEnabled(state == Qt.Checked)
+
+    def _update_color_options(self, style_name):
+        # For palette-specific styles, only show that color; for Default
+        # and New York styles, show all color options
+        model = self._palette_color_models.get(style_name, self._all_colors_model)
+        self.color_combo.blockSignals(True)
+        self.color_combo.setModel(model)
+        self.color_combo.blockSignals(False)
+        self.color_combo.setEnabled(model is self._all_colors_model)
+
+    def log_message(self, batch_text):
+        # Each signal carries a batch of lines, appended in a single relayout
+        self.log_window.appendPlainText(batch_text)
 
     def browse_path(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Project Location")
@@ -2,68 +2,267 @@ import os
 import subprocess
 import sys
 import shutil
+import json
+import hashlib
+import venv
+import asyncio
+import importlib.metadata
+import re
 from pathlib import Path
 
-def run_command(cmd, cwd=None):
+# Pinned Node.js tooling, installed from its lockfile into a local prefix
+NODE_TOOLS_DIR = Path('tools/node')
+NODE_PACKAGE_FILE = NODE_TOOLS_DIR / 'package.json'
+NODE_LOCK_FILE = NODE_TOOLS_DIR / 'package-lock.json'
+with open(Path(__file__).parent / NODE_PACKAGE_FILE) as f:
+    GLOBAL_DEPS = tuple(f"{pkg}@{version}" for pkg, version in json.load(f)['dependencies'].items())
+
+# Skip npm's audit and funding requests and its progress bar, and reuse
+# cached packages without revalidating them
+NPM_FLAGS = ('--prefer-offline', '--no-audit', '--no-fund', '--no-progress', '--loglevel=error')
+
+# The venv, and its interpreter, which runs pip directly instead of through
+# its console-script launcher
+VENV_DIR = Path('.venv')
+VENV_BIN = VENV_DIR / ('Scripts' if os.name == 'nt' else 'bin')
+VENV_PYTHON = str(VENV_BIN / ('python.exe' if os.name == 'nt' else 'python'))
+PIP_COMMAND = [VENV_PYTHON, '-Im', 'pip']
+
+# Hash of the last successful setup's inputs
+STAMP_FILE = VENV_DIR / '.setup_stamp'
+
+# Persistent wheel cache shared by repeated setups
+PIP_CACHE_DIR = Path.home() / '.cache' / 'next_express_pip'
+
+# Oldest supported Node.js major version
+MIN_NODE_VERSION = 20
+
+# Oldest venv pip that is used as is rather than upgraded first
+MIN_PIP_VERSION = (24, 0)
+
+def resolve(cmd):
+    """
+    Resolve the executable to an absolute path, which CPython requires
+    before it will start the command with posix_spawn instead of fork+exec
+    """
+    return [shutil.which(cmd[0]) or cmd[0]] + cmd[1:]
+
+# posix_spawn is also only used with close_fds=False. Python's own fds are
+# non-inheritable by default, so nothing leaks into the children
+CLOSE_FDS = os.name != 'posix'
+
+def run_command(cmd, cwd=None, env=None):
     """Run a command and handle errors"""
     try:
-        subprocess.run(cmd, check=True, cwd=cwd)
+        subprocess.run(resolve(cmd), check=True, cwd=cwd, env=env, close_fds=CLOSE_FDS)
     except subprocess.CalledProcessError as e:
         print(f"Error running command {' '.join(cmd)}: {e}")
         sys.exit(1)
 
-def setup_environment():
-    print("Setting up development environment...")
+def node_major_version(node_path):
+    """Return the major version of the given node binary, or None if unknown"""
+    result = subprocess.run([node_path, '--version'], capture_output=True, text=True,
+                            close_fds=CLOSE_FDS)
+    major = result.stdout.strip().lstrip('v').split('.')[0]
+    return int(major) if major.isdigit() else None
+
+def setup_stamp():
+    """Hash everything the setup installs, to detect unchanged reruns"""
+    digest = hashlib.blake2b()
+    for path in (Path('requirements.txt'), Path('constraints.txt'), NODE_PACKAGE_FILE, NODE_LOCK_FILE):
+        if path.is_file():
+            digest.update(path.read_bytes())
+    digest.update(repr(GLOBAL_DEPS).encode())
+    return digest.hexdigest()
+
+def link_node_tools(bin_dir):
+    """Expose the locally installed Node.js binaries inside the venv"""
+    node_bin = (NODE_TOOLS_DIR / 'node_modules' / '.bin').resolve()
+    for target in node_bin.iterdir():
+        if os.name == 'nt':
+            # npm generates .cmd shims on Windows; wrap them instead of
+            # symlinking, which needs elevated privileges there
+            if target.suffix.lower() == '.cmd':
+                (bin_dir / target.name).write_text(f'@"{target}" %*\r\n')
+            continue
+        link = bin_dir / target.name
+        if link.is_symlink() or link.exists():
+            link.unlink()
+        link.symlink_to(target)
+
+def site_packages():
+    """Locate the venv's site-packages without starting its interpreter"""
+    if os.name == 'nt':
+        return VENV_DIR / 'Lib' / 'site-packages'
+    return next((VENV_DIR / 'lib').glob('python*/site-packages'), None)
+
+def venv_pip_version():
+    """Read the venv's pip version from its dist-info directory name"""
+    packages = site_packages()
+    if packages is None:
+        return None
+    for info in packages.glob('pip-*.dist-info'):
+        version = info.name[len('pip-'):-len('.dist-info')]
+        try:
+            return tuple(int(part) for part in version.split('.')[:2])
+        except ValueError:
+            return None
+    return None
+
+async def run_command_async(cmd, cwd=None, env=None):
+    """Run a command without blocking the event loop, raising on failure"""
+    process = await asyncio.create_subprocess_exec(*resolve(cmd), cwd=cwd, env=env,
+                                                   close_fds=CLOSE_FDS)
+    returncode = await process.wait()
+    if returncode != 0:
+        error = subprocess.CalledProcessError(returncode, cmd)
+        print(f"Error running command {' '.join(cmd)}: {error}")
+        raise error
+
+async def install_python(uv_path):
+    """Install the Python dependencies into the venv and precompile them"""
+    if uv_path:
+        # uv needs no pip inside the venv, so there is nothing to upgrade
+        print("Installing Python dependencies with uv...")
+        await run_command_async([
+            uv_path, 'pip', 'install', '--python', VENV_PYTHON,
+            '--only-binary', ':all:',
+            '-r', 'requirements.txt', '-c', 'constraints.txt'
+        ])
+    else:
+        # Use a persistent wheel cache and skip pip's version check round-trip
+        pip_env = {
+            **os.environ,
+            'PIP_CACHE_DIR': str(PIP_CACHE_DIR),
+            'PIP_DISABLE_PIP_VERSION_CHECK': '1',
+            'PIP_NO_INPUT': '1'
+        }
+        
+        # Upgrade pip in the same run as the install, unless it is already
+        # recent enough
+        install_command = PIP_COMMAND + ['install']
+        pip_version = venv_pip_version()
+        if pip_version is None or pip_version < MIN_PIP_VERSION:
+            print("Upgrading pip and installing Python dependencies...")
+            install_command += ['--upgrade', 'pip']
+        else:
+            print("Installing Python dependencies...")
+        await run_command_async(install_command + [
+            '--only-binary=:all:', '--prefer-binary', '--use-feature=fast-deps',
+            '-r', 'requirements.txt', '-c', 'constraints.txt'
+        ], env=pip_env)
     
-    # Create Python virtual environment if it doesn't exist
-    if not os.path.exists('.venv'):
-        print("Creating Python virtual environment...")
-        run_command([sys.executable, '-m', 'venv', '.venv'])
+    # Byte-compile the venv up front, in parallel across all cores, so the
+    # first app launch doesn't pay for it
+    print("Precompiling Python packages...")
+    await run_command_async([VENV_PYTHON, '-Im', 'compileall', '-q', '-j', '0', str(VENV_DIR)])
+
+async def install_node():
+    """
+    Install the pinned Node.js tooling from its committed lockfile, which
+    skips npm's dependency resolution entirely
+    """
+    if not NODE_LOCK_FILE.is_file():
+        # Recovery path only: a plain install resolves the tree and writes
+        # the lockfile in the same pass, and may pick different transitive
+        # versions than the committed lockfile would
+        print(f"Warning: {NODE_LOCK_FILE} is missing, installing without it. "
+              "Commit the generated file so later setups skip resolution.")
+        await run_command_async(['npm', 'install', '--prefix', str(NODE_TOOLS_DIR), *NPM_FLAGS])
+        return
+    print("Installing Node.js dependencies...")
+    await run_command_async(['npm', 'ci', '--prefix', str(NODE_TOOLS_DIR), *NPM_FLAGS])
+
+async def install_all(uv_path):
+    """Run the Python and Node.js installs concurrently, exiting if either fails"""
+    results = await asyncio.gather(install_python(uv_path), install_node(),
+                                   return_exceptions=True)
+    failed = False
+    for result in results:
+        if isinstance(result, BaseException):
+            if not isinstance(result, subprocess.CalledProcessError):
+                print(f"Installation failed: {result}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+def normalize(name):
+    """Normalize a Python distribution name for comparison"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+def verify_installations():
+    """
+    Check that every requirement and Node.js package is installed, reading
+    package metadata in process instead of running pip list or npm list
+    """
+    packages = site_packages()
+    installed = set()
+    if packages is not None:
+        installed = {normalize(dist.metadata['Name'])
+                     for dist in importlib.metadata.distributions(path=[str(packages)])}
+    with open('requirements.txt') as f:
+        required = [line.split('==')[0].strip() for line in f
+                    if line.strip() and not line.startswith('#')]
+    missing = [name for name in required if normalize(name) not in installed]
     
-    # Determine pip path based on OS
-    pip_path = str(Path('.venv/Scripts/pip' if os.name == 'nt' else '.venv/bin/pip'))
+    node_modules = NODE_TOOLS_DIR / 'node_modules'
+    missing += [dep for dep in GLOBAL_DEPS
+                if not (node_modules / dep.rsplit('@', 1)[0] / 'package.json').is_file()]
     
-    # Upgrade pip
-    print("Upgrading pip...")
-    run_command([pip_path, 'install', '--upgrade', 'pip'])
+    if missing:
+        raise Exception(f"missing {', '.join(missing)}")
+    print(f"✓ {len(installed)} Python packages, {len(GLOBAL_DEPS)} Node.js tools")
+
+def setup_environment(force=False):
+    print("Setting up development environment...")
     
-    # Install Python dependencies
-    print("Installing Python dependencies...")
-    run_command([pip_path, 'install', '-r', 'requirements.txt'])
+    # Skip everything if nothing changed since the last successful setup and
+    # everything it installed is still there
+    stamp = setup_stamp()
+    if not force and STAMP_FILE.is_file() and STAMP_FILE.read_text() == stamp:
+        try:
+            verify_installations()
+        except Exception as e:
+            print(f"Installation is incomplete ({e}), reinstalling...")
+        else:
+            print("Environment is already up to date.")
+            return
     
-    # Check if Node.js is installed
-    try:
-        subprocess.run(['node', '--version'], check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("Node.js not found. Please install Node.js (version 20+) from https://nodejs.org/")
+    # Check if Node.js and npm are installed with a PATH lookup, running
+    # node only to enforce the minimum version
+    node_path = shutil.which('node')
+    if node_path is None:
+        print(f"Node.js not found. Please install Node.js (version {MIN_NODE_VERSION}+) from https://nodejs.org/")
         sys.exit(1)
-    
-    # Check if npm is installed
-    try:
-        subprocess.run(['npm', '--version'], check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if shutil.which('npm') is None:
         print("npm not found. Please install Node.js which includes npm")
         sys.exit(1)
+    node_version = node_major_version(node_path)
+    if node_version is None or node_version < MIN_NODE_VERSION:
+        print(f"Node.js {MIN_NODE_VERSION}+ is required. Please upgrade from https://nodejs.org/")
+        sys.exit(1)
     
-    # Install global Node.js dependencies
-    print("Installing global Node.js dependencies...")
-    global_deps = [
-        'next@latest',
-        'create-next-app@latest',
-        'typescript@latest',
-        'shadcn-ui@latest'
-    ]
-    run_command(['npm', 'install', '-g'] + global_deps)
+    # Prefer uv for the Python side when it is available
+    uv_path = shutil.which('uv')
+    
+    # Create Python virtual environment if it doesn't exist
+    if not VENV_DIR.exists():
+        print("Creating Python virtual environment...")
+        if uv_path:
+            run_command([uv_path, 'venv', str(VENV_DIR)])
+        else:
+            venv.EnvBuilder(with_pip=True, symlinks=(os.name != 'nt')).create(VENV_DIR)
+    
+    # The Python and Node.js installs are independent, so run them side by side
+    asyncio.run(install_all(uv_path))
+    link_node_tools(VENV_BIN)
     
     print("\nVerifying installations...")
     try:
-        # Verify Python environment
-        run_command([pip_path, 'list'])
+        verify_installations()
         
-        # Verify Node.js installations
-        run_command(['node', '--version'])
-        run_command(['npm', '--version'])
-        run_command(['npm', 'list', '-g', '--depth=0'])
+        # Rehash, since the lockfile may have just been generated
+        STAMP_FILE.write_text(setup_stamp())
         
         print("\nEnvironment setup complete! 🚀")
         print("\nTo activate the virtual environment:")
@@ -81,7 +280,15 @@ def setup_environment():
 
 if __name__ == "__main__":
     try:
-        setup_environment()
+        if '--verify' in sys.argv[1:]:
+            # Only check the existing environment, without installing anything
+            try:
+                verify_installations()
+            except Exception as e:
+                print(f"Error during verification: {e}")
+                sys.exit(1)
+        else:
+            setup_environment(force='--force' in sys.argv[1:])
     except KeyboardInterrupt:
         print("\nSetup interrupted by user")
         sys.exit(1)